@@ -13,50 +13,752 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException, WebDriverException
+from lxml import etree
+from inspect_form import create_session
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from urllib.parse import urlsplit, urlencode, parse_qsl, urlunsplit
+from pathlib import Path
+import argparse
+import functools
+import hashlib
+import json
+import os
+import queue
+import random
+import re
+import subprocess
 import sys
+import tempfile
+import threading
 import time
 
+# re2 (pip install google-re2) scans in linear time however the input is
+# shaped; the standard library engine is used when it isn't installed
+try:
+    import re2 as _regex_engine
+except ImportError:
+    _regex_engine = re
+
+
+def _env_seconds(name, default):
+    """
+    Read a number of seconds from an environment variable.
+    
+    A value that isn't a whole number is reported and the default used, so a
+    typo in the environment can't stop the module from importing.
+    
+    Args:
+        name (str): Environment variable to read
+        default (int): Value to use if it is unset or invalid
+        
+    Returns:
+        int: Number of seconds
+    """
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        print(f"Warning: ignoring {name}={value!r}, expected a number of seconds", file=sys.stderr)
+        return default
+
+
+# Where lookup results and other state are cached between runs
+CACHE_DIR = Path("~/.cache/aberbin").expanduser()
+
+# How long a cached schedule is reused before the council site is queried again,
+# overridable with the AB_CACHE_TTL environment variable (in seconds)
+RESULT_CACHE_TTL = _env_seconds("AB_CACHE_TTL", 24 * 60 * 60)
+
+# How long the discovered form field locators are trusted before the form is rescanned
+FORM_CACHE_TTL = 7 * 24 * 60 * 60
+
+# How long a resolved ChromeDriver path is used before webdriver-manager is asked again
+DRIVER_CACHE_TTL = 7 * 24 * 60 * 60
+
+
+# Collection dates as they appear on the results page
+# Common date formats: DD/MM/YYYY, DD-MM-YYYY, DD Month YYYY, Monday DD Month YYYY
+# The case-insensitive flag is inline so the pattern compiles the same way in re2
+_DATE_RE = _regex_engine.compile(
+    r'(?i)'
+    r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b'
+    r'|\b\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4}\b'
+    r'|\b(?:Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)\s+\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4}\b'
+)
+
+
+def _write_json_atomic(path, data):
+    """
+    Write JSON to a file by renaming a finished temporary file into place.
+    
+    Readers never see a partly written file, and concurrent writers of the
+    same path each replace it whole instead of interleaving their output.
+    
+    Args:
+        path (Path): File to write
+        data: JSON-serialisable value to store
+        
+    Raises:
+        OSError: If the file can't be written
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+@functools.lru_cache(maxsize=None)
+def chrome_major_version():
+    """
+    Return the major version of the installed Chrome, or None if it can't be found.
+    
+    The result is remembered for the life of the process, so starting several
+    drivers only asks Chrome for its version once.
+    
+    Returns:
+        str: Major version number, e.g. "126"
+    """
+    for binary in ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser",
+                   "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"):
+        try:
+            output = subprocess.check_output([binary, "--version"], stderr=subprocess.DEVNULL, text=True)
+        except (OSError, subprocess.CalledProcessError):
+            continue
+        match = re.search(r"(\d+)\.", output)
+        if match:
+            return match.group(1)
+    return None
+
+
+def chromedriver_path(refresh=False):
+    """
+    Return the path to a ChromeDriver binary, downloading it if needed.
+    
+    webdriver-manager checks online for the right driver version every time it
+    is asked, so the path it resolves is remembered along with the Chrome
+    version it was resolved for. The cached path is reused while the binary
+    exists, Chrome hasn't changed major version and DRIVER_CACHE_TTL hasn't
+    passed. Setting AB_NO_DRIVER_CACHE=1 always asks webdriver-manager.
+    
+    Args:
+        refresh (bool): Ask webdriver-manager again even if a path is cached
+        
+    Returns:
+        str: Path to the ChromeDriver executable
+    """
+    cache_file = CACHE_DIR / "driver.json"
+    
+    if not refresh and os.environ.get("AB_NO_DRIVER_CACHE") != "1":
+        try:
+            with open(cache_file) as f:
+                cached = json.load(f)
+            # The cheap checks come first; Chrome is only asked for its
+            # version when the cached path is otherwise still usable
+            if time.time() - cached["time"] < DRIVER_CACHE_TTL \
+                    and os.path.exists(cached["path"]) \
+                    and cached["chrome_major"] == chrome_major_version():
+                return cached["path"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+    
+    path = ChromeDriverManager().install()
+    try:
+        _write_json_atomic(cache_file, {"path": path, "chrome_major": chrome_major_version(), "time": time.time()})
+    except OSError:
+        pass
+    return path
+
+
+def create_driver(headless=True, log_network=False):
+    """
+    Start a Chrome WebDriver configured for looking up schedules.
+    
+    Args:
+        headless (bool): Run the browser in headless mode (no GUI)
+        log_network (bool): Record network events in the performance log, for
+            BinScheduleChecker.capture_api_calls
+        
+    Returns:
+        WebDriver: The started driver
+    """
+    chrome_options = Options()
+    
+    if log_network:
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    
+    # Only form fields are read, so don't wait for images and other
+    # subresources before driver.get() returns; the explicit waits in the
+    # lookup cover the parts that are rendered later.
+    chrome_options.page_load_strategy = "eager"
+    
+    if headless:
+        chrome_options.add_argument("--headless=new")
+    
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options.add_argument("--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36")
+    
+    # Skip images and background work Chrome would otherwise do at startup.
+    # Stylesheets are still loaded because the lookup relies on is_displayed().
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+    for flag in ("--disable-extensions", "--disable-background-networking", "--disable-sync",
+                 "--disable-translate", "--metrics-recording-only", "--no-first-run"):
+        chrome_options.add_argument(flag)
+    chrome_options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2,
+    })
+    
+    service = Service(chromedriver_path())
+    driver = webdriver.Chrome(service=service, options=chrome_options)
+    # Elements that may be missing are looked up with find_elements and
+    # anything rendered later has an explicit wait, so an implicit wait would
+    # only add delay to every lookup that comes back empty
+    driver.implicitly_wait(0)
+    return driver
+
+
+class BrowserPool:
+    """
+    Keeps Chrome drivers open so they can be reused across lookups.
+    
+    Starting Chrome dominates the time of a single lookup, so checkers that
+    share a pool borrow an already running browser instead of starting their
+    own. Drivers are created on demand and at most size of them are kept.
+    """
+    
+    def __init__(self, size=None, headless=True, log_network=False):
+        """
+        Args:
+            size (int): Number of idle drivers to keep, defaults to the POOL_SIZE
+                environment variable or 1
+            headless (bool): Run browsers in headless mode (no GUI)
+            log_network (bool): Start browsers with network logging enabled
+        """
+        self.size = size or int(os.environ.get("POOL_SIZE", "1"))
+        self.headless = headless
+        self.log_network = log_network
+        self._idle = queue.Queue()
+    
+    def acquire(self):
+        """Return an idle driver, starting a new one if none is available."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return create_driver(self.headless, self.log_network)
+    
+    def release(self, driver):
+        """Reset a driver's state and return it to the pool, or quit it if the pool is full."""
+        try:
+            driver.switch_to.default_content()
+            driver.delete_all_cookies()
+        except WebDriverException:
+            # The browser has crashed or been closed, so don't hand it out again
+            driver.quit()
+            return
+        
+        if self._idle.qsize() >= self.size:
+            driver.quit()
+        else:
+            self._idle.put(driver)
+    
+    def close(self):
+        """Quit all idle drivers."""
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            driver.quit()
+
+
+def _walk_json(value):
+    """Yield every object nested anywhere in a decoded JSON value, outermost first."""
+    if isinstance(value, dict):
+        yield value
+        for item in value.values():
+            yield from _walk_json(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _walk_json(item)
+
+
+def _replace_json_values(value, old, new):
+    """
+    Replace scalar values equal to old anywhere in a decoded JSON value.
+    
+    Only whole values are compared, as strings, so an id like "1" doesn't match
+    inside other numbers or text. A replaced number stays a number when new is
+    numeric.
+    
+    Args:
+        value: Decoded JSON value to search
+        old (str): Value to replace
+        new (str): Replacement value
+        
+    Returns:
+        tuple: (updated value, number of values replaced)
+    """
+    if isinstance(value, dict):
+        count = 0
+        updated = {}
+        for key, item in value.items():
+            updated[key], replaced = _replace_json_values(item, old, new)
+            count += replaced
+        return updated, count
+    if isinstance(value, list):
+        count = 0
+        updated = []
+        for item in value:
+            item, replaced = _replace_json_values(item, old, new)
+            updated.append(item)
+            count += replaced
+        return updated, count
+    if value is None or isinstance(value, bool) or str(value) != old:
+        return value, 0
+    if isinstance(value, int) and new.isdigit():
+        return int(new), 1
+    return new, 1
+
+
+def _with_query(url, **params):
+    """Return url with the given query parameters set, keeping the others."""
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query, keep_blank_values=True))
+    query.update(params)
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def _add_collection(collections, bin_type, date):
+    """Record a collection unless one with the same type and date, ignoring case, is already there."""
+    key = (bin_type.lower(), date.lower())
+    if key not in collections:
+        collections[key] = {"bin_type": bin_type, "date": date}
+
+
+def _text(element, limit=None):
+    """
+    Return an element's text content with each string stripped, like get_text(strip=True).
+    
+    With a limit, collection stops as soon as the text is longer than limit
+    characters, so a large container's text is never built in full just to be
+    rejected for its length.
+    """
+    if limit is None:
+        return "".join(s.strip() for s in element.itertext())
+    
+    parts = []
+    length = 0
+    for s in element.itertext():
+        s = s.strip()
+        parts.append(s)
+        length += len(s)
+        if length > limit:
+            break
+    return "".join(parts)
+
 
 class BinScheduleChecker:
-    def __init__(self, headless=True):
+    # Elements visited by parse_results, and those whose text content it inspects
+    _PARSED_TAGS = ("div", "span", "p", "td", "li", "label", "input", "tr", "dt", "dd")
+    _TEXT_TAGS = frozenset({"div", "span", "p", "td", "li", "label"})
+    
+    # Longest element text parse_results uses, other than list items which are kept whole
+    _TEXT_LIMIT = 200
+    
+    # Words that mark text as describing a bin collection
+    _BIN_KEYWORDS = ('recycling', 'waste', 'garden', 'food', 'general', 'mixed', 'glass')
+    
+    # Bin types and the id prefix of their numbered date fields in the form
+    _BIN_FIELDS = {
+        "Mixed Recycling": "RecyclingDate",
+        "Food & Garden Waste": "GardenDate",
+        "General Waste": "GeneralDate"
+    }
+    
+    # Requests the form makes to the platform's session and lookup APIs
+    _API_URL_RE = re.compile(r"/(?:authapi|apibroker)/")
+    
+    # Single-pass, case-insensitive searches for the keywords above, and for the
+    # words that mark a div as possibly holding schedule information
+    _BIN_RE = re.compile("|".join(_BIN_KEYWORDS), re.IGNORECASE)
+    _SCHEDULE_DIV_RE = re.compile("bin|collection|waste|recycling", re.IGNORECASE)
+    
+    # XPath used by parse_results, compiled once
+    _BIN_TABLE_XP = etree.XPath("//table[%s]" % " or ".join(
+        "contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '%s')" % keyword
+        for keyword in _BIN_KEYWORDS
+    ))
+    
+    # Input types that can never be the postcode or street number field
+    _SKIP_INPUT_TYPES = frozenset({"hidden", "submit", "button", "reset", "image"})
+    
+    # Substrings of an input's name, id or placeholder that identify the form fields
+    _POSTCODE_RE = re.compile("post|code", re.IGNORECASE)
+    _NUMBER_RE = re.compile("street|number|house|property", re.IGNORECASE)
+    
+    # Defines isVisible(e) for the scripts below. It follows is_displayed():
+    # an element is hidden if it has no layout box, if its computed visibility
+    # is hidden (which descendants inherit), or if it or any ancestor is fully
+    # transparent.
+    _VISIBLE_JS = """
+        const isVisible = e => {
+            if (e.getClientRects().length === 0 || getComputedStyle(e).visibility === 'hidden') {
+                return false;
+            }
+            for (let a = e; a; a = a.parentElement) {
+                if (parseFloat(getComputedStyle(a).opacity) === 0) {
+                    return false;
+                }
+            }
+            return true;
+        };
+    """
+    
+    # Elements _find_button treats as buttons
+    _BUTTON_SELECTOR = "button, input[type='submit'], input[type='button']"
+    
+    # Returns the element, text, value, id and visibility of the buttons
+    # matching a CSS selector in a single round-trip
+    _BUTTONS_SCRIPT = _VISIBLE_JS + """
+        return Array.from(document.querySelectorAll(arguments[0])).map(e => ({
+            element: e,
+            text: e.innerText || '',
+            value: e.value || '',
+            id: e.id || '',
+            visible: isVisible(e)
+        }));
+    """
+    
+    # Returns the attributes _identify_form_fields needs for every input and
+    # select, along with the element itself, in a single round-trip
+    _SNAPSHOT_SCRIPT = _VISIBLE_JS + """
+        return Array.from(document.querySelectorAll('input, select')).map(e => ({
+            element: e,
+            tag: e.tagName.toLowerCase(),
+            type: e.type || '',
+            name: e.name || '',
+            id: e.id || '',
+            placeholder: e.getAttribute('placeholder') || '',
+            visible: isVisible(e)
+        }));
+    """
+    
+    # Returns the form's body as HTML for parse_results, without the script and
+    # style elements it would strip anyway, so they aren't sent over the wire
+    _RESULTS_HTML_SCRIPT = """
+        var body = document.body.cloneNode(true);
+        body.querySelectorAll('script, style').forEach(e => e.remove());
+        return body.outerHTML;
+    """
+    
+    # Returns an {id: value} object for the inputs matching a CSS selector
+    _FIELD_VALUES_SCRIPT = """
+        return Object.fromEntries(
+            Array.from(document.querySelectorAll(arguments[0])).map(e => [e.id, e.value])
+        );
+    """
+    
+    def __init__(self, headless=True, verbose=False, cache_ttl=RESULT_CACHE_TTL, pool=None, debug=False,
+                 use_api=False, delay=0):
         """
         Initialize the bin schedule checker with Selenium.
         
         Args:
             headless (bool): Run browser in headless mode (no GUI)
+            verbose (bool): Print progress messages while looking up a schedule
+            cache_ttl (int): Seconds to reuse a cached schedule for, 0 to disable caching
+            pool (BrowserPool): Borrow drivers from this pool instead of starting new ones
+            debug (bool): Include the page text in schedules where no dates were found
+            use_api (bool): Try replaying the API calls saved by capture_api_calls
+                before starting a browser
+            delay (float): Wait up to this many seconds, at random, before each
+                lookup that isn't answered from the cache
         """
         self.url = "https://integration.aberdeencity.gov.uk/service/bin_collection_calendar___view"
         self.headless = headless
+        self.pool = pool
+        self.debug = debug
+        self.verbose = verbose
+        self.cache_ttl = cache_ttl
+        self.use_api = use_api
+        self.delay = delay
         self.driver = None
+        self._form_cache = self._read_form_cache()
+        # Option value of the address picked by the last browser lookup
+        self._selected_address = None
+        self._session = None
     
     def setup_driver(self):
         """Set up the Selenium WebDriver."""
-        chrome_options = Options()
+        if self.pool:
+            self.driver = self.pool.acquire()
+        else:
+            self.driver = create_driver(self.headless)
+    
+    def close_driver(self):
+        """Close the WebDriver, or hand it back to the pool it came from, and any API session."""
+        if self.driver:
+            if self.pool:
+                self.pool.release(self.driver)
+            else:
+                self.driver.quit()
+            self.driver = None
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+    
+    def _log(self, message):
+        """Print a progress message when running verbosely."""
+        if self.verbose:
+            print(message)
+    
+    def _read_form_cache(self):
+        """Return the form layout saved by an earlier run, or None if missing or stale."""
+        try:
+            with open(CACHE_DIR / "form.json") as f:
+                entry = json.load(f)
+            if entry["url"] != self.url or time.time() - entry["time"] >= FORM_CACHE_TTL:
+                return None
+            return {
+                "form_hash": entry["form_hash"],
+                "postcode": tuple(entry["postcode"]),
+                "number": tuple(entry["number"]) if entry["number"] else None,
+                "address": tuple(entry["address"]) if entry["address"] else None
+            }
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+    
+    def _write_form_cache(self):
+        """Save the current field locators for later runs, or remove them if cleared."""
+        path = CACHE_DIR / "form.json"
+        try:
+            if self._form_cache is None:
+                if path.exists():
+                    path.unlink()
+                return
+            _write_json_atomic(path, dict(self._form_cache, url=self.url, time=time.time()))
+        except OSError:
+            # Caching is best effort; the form can always be scanned again
+            pass
+    
+    @staticmethod
+    def _form_hash(iframe_src):
+        """
+        Identify the form definition loaded in the iframe.
+        
+        The query string is left out as it can carry per-session values, while
+        the path names the form itself.
+        
+        Args:
+            iframe_src (str): The form iframe's src attribute
+            
+        Returns:
+            str: Hash to compare against the one stored with the cached layout
+        """
+        parts = urlsplit(iframe_src or "")
+        return hashlib.sha256(f"{parts.netloc}{parts.path}".encode("utf-8")).hexdigest()
+    
+    def _load_form(self, form_hash):
+        """
+        Find the postcode and street number fields in the form.
         
-        if self.headless:
-            chrome_options.add_argument("--headless=new")
+        The locators found by a scan are cached on the instance and on disk
+        along with the form's hash, so later lookups of the same form go
+        straight to the fields instead of probing every input.
         
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36")
+        Args:
+            form_hash (str): Hash of the form currently loaded, from _form_hash
+            
+        Returns:
+            tuple: (postcode_field, number_field) WebElements, either may be None
+        """
+        cache = self._form_cache
+        if cache is not None and cache["form_hash"] == form_hash:
+            postcode_fields = self.driver.find_elements(*cache["postcode"])
+            number_fields = self.driver.find_elements(*cache["number"]) if cache["number"] else [None]
+            if postcode_fields and number_fields:
+                return postcode_fields[0], number_fields[0]
+            
+            # The form has changed since it was cached, scan it again
+            self._form_cache = None
+            self._write_form_cache()
         
-        # Use webdriver-manager to automatically handle ChromeDriver
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        self.driver.implicitly_wait(10)
+        postcode_field, number_field = self._identify_form_fields()
+        
+        if postcode_field:
+            postcode_locator = self._locator(postcode_field)
+            number_locator = self._locator(number_field) if number_field else None
+            if postcode_locator and (number_locator or not number_field):
+                self._form_cache = {
+                    "form_hash": form_hash,
+                    "postcode": postcode_locator,
+                    "number": number_locator,
+                    "address": None
+                }
+                self._write_form_cache()
+        
+        return postcode_field, number_field
     
-    def close_driver(self):
-        """Close the WebDriver."""
-        if self.driver:
-            self.driver.quit()
+    def _find_address_select(self):
+        """
+        Find the dropdown listing the addresses in the searched postcode.
+        
+        A cached locator is tried first; otherwise the visible selects are
+        scanned and the one found is added to the cached form layout.
+        
+        Returns:
+            WebElement: The address select, or None if there isn't one
+        """
+        cache = self._form_cache
+        if cache is not None and cache["address"]:
+            for sel in self.driver.find_elements(*cache["address"]):
+                if sel.is_displayed():
+                    return sel
+        
+        for sel in self._snapshot_fields():
+            if sel["tag"] != "select" or not sel["visible"]:
+                continue
+            if any(term in sel["name"].lower() + sel["id"].lower() for term in ["address", "property", "street", "uprn"]):
+                self._log(f"Found address select: name={sel['name']}, id={sel['id']}")
+                if cache is not None and (sel["id"] or sel["name"]):
+                    cache["address"] = (By.ID, sel["id"]) if sel["id"] else (By.NAME, sel["name"])
+                    self._write_form_cache()
+                return sel["element"]
+        
+        return None
+    
+    @staticmethod
+    def _locator(element):
+        """Return a (By, value) locator that finds the element again, or None."""
+        field_id = element.get_attribute("id")
+        if field_id:
+            return (By.ID, field_id)
+        field_name = element.get_attribute("name")
+        if field_name:
+            return (By.NAME, field_name)
+        return None
+    
+    def _snapshot_fields(self):
+        """
+        Read the attributes of every input and select in the form in one call.
+        
+        Fetching each attribute through the WebDriver is a separate request to
+        chromedriver, so the identification code works from this snapshot and
+        only uses the returned elements for the fields it interacts with.
+        
+        Returns:
+            list: One dict per field, with the keys read by _SNAPSHOT_SCRIPT
+        """
+        return self.driver.execute_script(self._SNAPSHOT_SCRIPT)
+    
+    def _identify_form_fields(self):
+        """
+        Scan the form's inputs to find the postcode and street number fields.
+        
+        Returns:
+            tuple: (postcode_field, number_field) WebElements, either may be None
+        """
+        postcode_field = None
+        number_field = None
+        
+        # Try to find input fields
+        fields = self._snapshot_fields()
+        all_inputs = [field for field in fields if field["tag"] == "input"]
+        all_selects = [field for field in fields if field["tag"] == "select"]
+        
+        self._log(f"Found {len(all_inputs)} input fields and {len(all_selects)} select fields")
+        
+        # Print all visible fields for debugging
+        for i, inp in enumerate(all_inputs[:20]):  # Limit to first 20 for debugging
+            if inp["type"] in self._SKIP_INPUT_TYPES or not inp["visible"]:
+                continue
+            
+            self._log(f"  Input {i+1}: type={inp['type']}, name={inp['name']}, id={inp['id']}, placeholder={inp['placeholder']}")
+            
+            # Search the attributes together, with a space so no term can match
+            # across the join
+            blob = f"{inp['name']} {inp['id']} {inp['placeholder']}"
+            
+            # Try to identify postcode field
+            if not postcode_field:
+                if self._POSTCODE_RE.search(blob):
+                    postcode_field = inp["element"]
+                    self._log(f"    -> Identified as POSTCODE field")
+            
+            # Try to identify street number field
+            if not number_field:
+                if self._NUMBER_RE.search(blob):
+                    number_field = inp["element"]
+                    self._log(f"    -> Identified as NUMBER field")
+        
+        # Check select fields for address selection
+        for i, sel in enumerate(all_selects):
+            if sel["visible"]:
+                self._log(f"  Select {i+1}: name={sel['name']}, id={sel['id']}")
+        
+        return postcode_field, number_field
+    
+    def _cache_path(self, postcode, street_number):
+        """Return the file a schedule for this address is cached in."""
+        # Normalise so "ab10 1ab" and "AB101AB" share an entry
+        postcode = postcode.upper().replace(" ", "")
+        key = hashlib.sha1(f"{postcode}|{street_number.strip()}".encode()).hexdigest()
+        return CACHE_DIR / "lookups" / f"{key}.json"
+    
+    def _read_cached_schedule(self, postcode, street_number):
+        """Return the cached schedule for an address, or None if missing or expired."""
+        if self.cache_ttl <= 0:
+            return None
+        try:
+            with open(self._cache_path(postcode, street_number)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        # Anything that isn't an entry this class wrote counts as a miss
+        if not isinstance(entry, dict):
+            return None
+        written = entry.get("time")
+        schedule = entry.get("schedule")
+        if not isinstance(written, (int, float)) or not isinstance(schedule, dict):
+            return None
+        if time.time() - written >= self.cache_ttl:
+            return None
+        return schedule
+    
+    def _write_cached_schedule(self, postcode, street_number, schedule):
+        """Cache a successfully retrieved schedule for an address."""
+        if self.cache_ttl <= 0:
+            return
+        path = self._cache_path(postcode, street_number)
+        try:
+            _write_json_atomic(path, {"time": time.time(), "schedule": schedule})
+        except OSError:
+            # Caching is best effort; the lookup itself succeeded
+            pass
     
     def get_bin_schedule(self, postcode, street_number):
         """
         Retrieve bin collection schedule for a given postcode and street number.
         
+        Schedules are cached on disk for cache_ttl seconds, so repeat lookups of
+        the same address skip the website entirely. Only schedules read from
+        the date fields are cached, never errors or fallback parses.
+        On a cache miss with use_api set, API calls saved by capture_api_calls
+        are replayed over HTTP first, and the browser is only started if that
+        isn't possible.
+        
         Args:
             postcode (str): The postcode (e.g., 'AB10 1AB')
             street_number (str): The street number
@@ -64,154 +766,322 @@ class BinScheduleChecker:
         Returns:
             dict: Bin collection schedule information
         """
+        schedule = self._read_cached_schedule(postcode, street_number)
+        if schedule is not None:
+            self._log("Using cached schedule")
+            return schedule
+        
+        if self.delay > 0:
+            time.sleep(random.uniform(0, self.delay))
+        
+        # Replaying the captured API calls needs no browser; start one only if
+        # there are none or they don't work for this address
+        schedule = self._lookup_via_api(postcode, street_number) if self.use_api else None
+        if schedule is None:
+            if self.driver is None:
+                self.setup_driver()
+            schedule = self._lookup_schedule(postcode, street_number)
+        
+        if self._is_cacheable(schedule):
+            self._write_cached_schedule(postcode, street_number, schedule)
+        return schedule
+    
+    def _read_api_capture(self):
+        """Return the API calls saved by capture_api_calls, or None if there are none."""
+        try:
+            with open(CACHE_DIR / "api.json") as f:
+                capture = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(capture, dict) or capture.get("url") != self.url:
+            return None
+        return capture
+    
+    def capture_api_calls(self, postcode, street_number):
+        """
+        Look up an address in the browser and save the form's API calls for reuse.
+        
+        The form is a front end to the platform's JSON lookup API. The requests
+        it makes during a successful lookup, with their responses, are saved to
+        api.json in the cache directory, and later lookups replay them over
+        plain HTTP for other addresses instead of starting Chrome.
+        
+        The browser must log network events, so the checker's pool has to be
+        created with log_network=True.
+        
+        Args:
+            postcode (str): A postcode known to work, e.g. your own
+            street_number (str): A street number in that postcode
+            
+        Returns:
+            bool: True if the calls were captured and saved
+        """
+        if self.driver is None:
+            self.setup_driver()
+        
+        self._selected_address = None
+        schedule = self._lookup_schedule(postcode, street_number)
+        if not self._is_cacheable(schedule) or not self._selected_address:
+            self._log("The lookup didn't complete, so there is nothing to capture")
+            return False
+        
+        # Pick the API requests out of the performance log, then ask Chrome for
+        # their response bodies while it still has them
+        api_requests = {}
+        for entry in self.driver.get_log("performance"):
+            try:
+                message = json.loads(entry["message"])["message"]
+                if message["method"] != "Network.requestWillBeSent":
+                    continue
+                request_id = message["params"]["requestId"]
+                request = message["params"]["request"]
+                url = request["url"]
+            except (ValueError, KeyError, TypeError):
+                # Entries Chrome logs in another shape aren't requests we want
+                continue
+            if isinstance(url, str) and self._API_URL_RE.search(url):
+                api_requests[request_id] = request
+        
+        calls = []
+        for request_id, request in api_requests.items():
+            try:
+                body = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+                response = json.loads(body["body"])
+            except (WebDriverException, ValueError):
+                response = None
+            calls.append({
+                "url": request["url"],
+                "method": request["method"],
+                "body": request.get("postData"),
+                "response": response
+            })
+        
+        if not calls:
+            self._log("No API requests were seen during the lookup")
+            return False
+        
+        try:
+            _write_json_atomic(CACHE_DIR / "api.json", {
+                "url": self.url,
+                "time": time.time(),
+                "postcode": postcode,
+                "address": self._selected_address,
+                "calls": calls
+            })
+        except OSError:
+            return False
+        self._log(f"Saved {len(calls)} API calls")
+        return True
+    
+    def _lookup_via_api(self, postcode, street_number):
+        """
+        Look up a schedule by replaying the captured API calls over HTTP.
+        
+        Returns:
+            dict: Bin collection schedule, or None if no calls have been captured
+                or the replay didn't produce any dates
+        """
+        capture = self._read_api_capture()
+        if capture is None:
+            return None
+        
+        self._log("Looking up the schedule through the form's API...")
         try:
-            print(f"Loading webpage...")
+            values = self._replay_api_calls(capture, postcode, street_number)
+        except Exception as e:
+            # Whatever goes wrong, the browser lookup can still answer
+            self._log(f"API lookup failed ({type(e).__name__}: {e}), using the browser instead")
+            return None
+        
+        schedule = self._schedule_from_fields(values)
+        if not schedule["collections"]:
+            self._log("The API returned no dates, using the browser instead")
+            return None
+        return schedule
+    
+    def _replay_api_calls(self, capture, postcode, street_number):
+        """
+        Make the captured API calls again for a different address.
+        
+        A new platform session is opened, and the request bodies are decoded so
+        that values equal to the captured postcode are swapped for this one.
+        Once the address lookup has answered, values equal to the captured
+        address id are swapped for the id matching street_number.
+        
+        Returns:
+            dict: Values of the collection date fields found in the responses,
+                keyed by field id
+        
+        Raises:
+            ValueError: If the street number isn't in the postcode's addresses,
+                or the captured postcode or address id never appeared in a
+                request, so the replay would answer for the captured address
+            requests.RequestException: If a request fails
+        """
+        session = self._api_session()
+        
+        sid = None
+        address = None
+        postcode_swaps = 0
+        address_swaps = 0
+        values = {}
+        
+        for call in capture["calls"]:
+            url = call["url"]
+            if "/authapi/" in url:
+                # Opens the session whose id the lookup calls are made under
+                response = session.get(url, timeout=20)
+                response.raise_for_status()
+                data = response.json()
+                if isinstance(data, dict) and data.get("auth-session"):
+                    sid = data["auth-session"]
+                continue
+            
+            if sid:
+                url = _with_query(url, sid=sid, _=str(int(time.time() * 1000)))
+            
+            body = call["body"]
+            if body:
+                payload, swapped = _replace_json_values(json.loads(body), capture["postcode"], postcode)
+                postcode_swaps += swapped
+                payload, swapped = _replace_json_values(payload, capture["address"], address or "")
+                if swapped and address is None:
+                    raise ValueError(f"could not find address '{street_number}' in postcode '{postcode}'")
+                address_swaps += swapped
+                body = json.dumps(payload)
+            
+            response = session.request(call["method"], url, data=body, timeout=20,
+                                       headers={"Content-Type": "application/json"})
+            response.raise_for_status()
+            data = response.json()
+            
+            if address is None:
+                address = self._find_address_id(call["response"], capture["address"], data, street_number)
+            
+            for obj in _walk_json(data):
+                for key, value in obj.items():
+                    if key.startswith(tuple(self._BIN_FIELDS.values())) and isinstance(value, str) and value.strip():
+                        values[key] = value
+        
+        if not postcode_swaps or not address_swaps:
+            raise ValueError("the captured postcode or address id wasn't found in the requests")
+        
+        return values
+    
+    def _api_session(self):
+        """Return this checker's HTTP session for the form's API, creating it on first use."""
+        if self._session is None:
+            # Pooled connections and retries on transient errors, as for inspect_form
+            self._session = create_session()
+        return self._session
+    
+    @staticmethod
+    def _find_address_id(captured_response, captured_address, response, street_number):
+        """
+        Find the id of street_number's address in an address lookup response.
+        
+        The captured response shows which key held the id of the captured
+        address; the same key is read from the row of the new response that
+        starts with the street number, as the dropdown options do.
+        
+        Returns:
+            str: The address id, or None if the response holds no matching row
+        """
+        key = None
+        for row in _walk_json(captured_response):
+            key = next((k for k, v in row.items() if str(v) == captured_address), None)
+            if key is not None:
+                break
+        if key is None:
+            return None
+        
+        for row in _walk_json(response):
+            if key not in row:
+                continue
+            for value in row.values():
+                if isinstance(value, str) and (value.strip().startswith(street_number + " ") or
+                                               value.strip().startswith(street_number + ",")):
+                    return str(row[key])
+        return None
+    
+    @staticmethod
+    def _is_cacheable(schedule):
+        """
+        Check whether a looked-up schedule should be cached.
+        
+        Only schedules read from the labelled date fields are cached; theirs are
+        the only collections that carry a "dates" list. Results of the fallback
+        page parse, such as "Date found on page" guesses or debug page text, are
+        looked up again next time.
+        
+        Args:
+            schedule (dict): Schedule returned by _lookup_schedule
+            
+        Returns:
+            bool: True if the schedule can be reused for cache_ttl seconds
+        """
+        collections = schedule.get("collections")
+        if not collections or "error" in schedule or "page_text" in schedule:
+            return False
+        return all("dates" in col for col in collections)
+    
+    def _lookup_schedule(self, postcode, street_number):
+        """Look up the schedule for an address on the council website."""
+        try:
+            self._log(f"Loading webpage...")
             self.driver.get(self.url)
             
             # Wait for the iframe to load
-            print("Waiting for form to load...")
+            self._log("Waiting for form to load...")
             wait = WebDriverWait(self.driver, 20)
             
             # Switch to the iframe containing the form
             iframe = wait.until(EC.presence_of_element_located((By.ID, "fillform-frame-1")))
+            form_hash = self._form_hash(iframe.get_attribute("src"))
             self.driver.switch_to.frame(iframe)
             
-            print("Form loaded. Looking for input fields...")
-            
-            # Wait a bit more for the form fields to be ready
-            time.sleep(2)
-            
-            # Try to find postcode and street number fields
-            # Common patterns for field identification
-            field_patterns = [
-                # By ID
-                ("id", ["postcode", "Postcode", "post_code", "txtPostcode"]),
-                ("id", ["street", "Street", "street_number", "number", "housenumber", "txtStreet"]),
-                # By name
-                ("name", ["postcode", "Postcode", "post_code"]),
-                ("name", ["street", "Street", "street_number", "number", "housenumber"]),
-                # By placeholder
-                ("placeholder", ["postcode", "Postcode", "post code"]),
-                ("placeholder", ["street", "Street", "number"]),
-            ]
-            
-            postcode_field = None
-            number_field = None
-            
-            # Try to find input fields
-            all_inputs = self.driver.find_elements(By.TAG_NAME, "input")
-            all_selects = self.driver.find_elements(By.TAG_NAME, "select")
+            self._log("Form loaded. Looking for input fields...")
             
-            print(f"Found {len(all_inputs)} input fields and {len(all_selects)} select fields")
+            # The fields are rendered by JavaScript after the frame loads
+            wait.until(EC.visibility_of_any_elements_located((By.CSS_SELECTOR, "input:not([type='hidden'])")))
             
-            # Print all visible fields for debugging
-            for i, inp in enumerate(all_inputs[:20]):  # Limit to first 20 for debugging
-                try:
-                    field_type = inp.get_attribute("type")
-                    field_name = inp.get_attribute("name")
-                    field_id = inp.get_attribute("id")
-                    field_placeholder = inp.get_attribute("placeholder")
-                    is_visible = inp.is_displayed()
-                    
-                    if is_visible and field_type not in ["hidden", "submit", "button"]:
-                        print(f"  Input {i+1}: type={field_type}, name={field_name}, id={field_id}, placeholder={field_placeholder}")
-                        
-                        # Try to identify postcode field
-                        if not postcode_field:
-                            if any(term in str(field_name).lower() for term in ["post", "code"]) or \
-                               any(term in str(field_id).lower() for term in ["post", "code"]) or \
-                               any(term in str(field_placeholder).lower() for term in ["post", "code"]):
-                                postcode_field = inp
-                                print(f"    -> Identified as POSTCODE field")
-                        
-                        # Try to identify street number field
-                        if not number_field:
-                            if any(term in str(field_name).lower() for term in ["street", "number", "house", "property"]) or \
-                               any(term in str(field_id).lower() for term in ["street", "number", "house", "property"]) or \
-                               any(term in str(field_placeholder).lower() for term in ["street", "number", "house", "property"]):
-                                number_field = inp
-                                print(f"    -> Identified as NUMBER field")
-                except:
-                    pass
-            
-            # Check select fields for address selection
-            for i, sel in enumerate(all_selects):
-                try:
-                    field_name = sel.get_attribute("name")
-                    field_id = sel.get_attribute("id")
-                    is_visible = sel.is_displayed()
-                    
-                    if is_visible:
-                        print(f"  Select {i+1}: name={field_name}, id={field_id}")
-                except:
-                    pass
+            postcode_field, number_field = self._load_form(form_hash)
             
             # Handle two-step process: postcode search first
             if postcode_field and not number_field:
-                print(f"\nThis appears to be a two-step form (postcode search first)")
-                print(f"Step 1: Entering postcode: {postcode}")
+                self._log(f"\nThis appears to be a two-step form (postcode search first)")
+                self._log(f"Step 1: Entering postcode: {postcode}")
                 postcode_field.clear()
                 postcode_field.send_keys(postcode)
                 
                 # Find and click search button
-                search_button = None
-                try:
-                    buttons = self.driver.find_elements(By.TAG_NAME, "button")
-                    buttons.extend(self.driver.find_elements(By.CSS_SELECTOR, "input[type='submit']"))
-                    buttons.extend(self.driver.find_elements(By.CSS_SELECTOR, "input[type='button']"))
-                except Exception as e:
-                    print(f"Error finding buttons: {e}")
-                    buttons = []
-                
-                for btn in buttons:
-                    try:
-                        if btn.is_displayed():
-                            btn_text = (btn.text or "").lower()
-                            btn_value = (btn.get_attribute("value") or "").lower()
-                            btn_id = (btn.get_attribute("id") or "").lower()
-                            
-                            if any(term in btn_text + btn_value + btn_id for term in ["search", "find", "look"]):
-                                search_button = btn
-                                print(f"Found search button: {btn.text or btn.get_attribute('value') or btn.get_attribute('id')}")
-                                break
-                    except:
-                        pass
+                search_button = self._find_button(["search", "find", "look"], match_id=True)
                 
                 if not search_button:
                     # Try to submit the form by pressing Enter
-                    print("No search button found, trying to submit via Enter key...")
+                    self._log("No search button found, trying to submit via Enter key...")
                     from selenium.webdriver.common.keys import Keys
                     postcode_field.send_keys(Keys.RETURN)
-                    time.sleep(3)
                 else:
-                    print("Clicking search button...")
+                    self._log(f"Found search button: {search_button.text or search_button.get_attribute('value') or search_button.get_attribute('id')}")
+                    self._log("Clicking search button...")
                     try:
                         search_button.click()
                     except:
                         # If click fails, try JavaScript click
                         self.driver.execute_script("arguments[0].click();", search_button)
-                    time.sleep(3)
                 
                 # Now look for address selection dropdown or list
-                print("\nStep 2: Looking for address selection...")
+                self._log("\nStep 2: Looking for address selection...")
                 
-                # Wait for the select dropdown to appear
+                # Wait for the search results to fill a dropdown. An empty select
+                # can already be on the page, so its presence alone isn't enough.
                 try:
-                    wait.until(EC.presence_of_element_located((By.TAG_NAME, "select")))
+                    wait.until(self._addresses_loaded)
                 except TimeoutException:
-                    print("Timeout waiting for address dropdown")
+                    self._log("Timeout waiting for address dropdown")
                 
-                all_selects = self.driver.find_elements(By.TAG_NAME, "select")
-                
-                address_select = None
-                for sel in all_selects:
-                    if sel.is_displayed():
-                        field_name = sel.get_attribute("name") or ""
-                        field_id = sel.get_attribute("id") or ""
-                        if any(term in field_name.lower() + field_id.lower() for term in ["address", "property", "street", "uprn"]):
-                            address_select = sel
-                            print(f"Found address select: name={field_name}, id={field_id}")
-                            break
+                address_select = self._find_address_select()
                 
                 if not address_select:
                     return {"error": "Could not find address selection dropdown after postcode search"}
@@ -221,149 +1091,110 @@ class BinScheduleChecker:
                 select_element = Select(address_select)
                 options = select_element.options
                 
-                print(f"Found {len(options)} address options")
+                self._log(f"Found {len(options)} address options")
                 
                 # Try to match street number
                 matched_option = None
                 for option in options:
                     option_text = option.text
-                    print(f"  Option: {option_text[:100]}")
+                    self._log(f"  Option: {option_text[:100]}")
                     
                     # Check if street number appears at start of address
                     if option_text.strip().startswith(street_number + " ") or \
                        option_text.strip().startswith(street_number + ","):
                         matched_option = option
-                        print(f"  ✓ Matched!")
+                        self._log(f"  ✓ Matched!")
                         break
                 
                 if not matched_option and len(options) > 1:
                     # Show available options and ask which one
-                    print("\n⚠️  Could not automatically match street number.")
-                    print(f"Available addresses for postcode {postcode}:")
+                    self._log("\n⚠️  Could not automatically match street number.")
+                    self._log(f"Available addresses for postcode {postcode}:")
                     for i, option in enumerate(options[1:], 1):  # Skip first option (usually blank)
-                        print(f"  {i}. {option.text}")
+                        self._log(f"  {i}. {option.text}")
                     return {
                         "error": f"Could not find address '{street_number}' in postcode '{postcode}'",
                         "addresses": [opt.text for opt in options[1:]]
                     }
                 
                 if matched_option:
-                    print(f"\nSelecting address: {matched_option.text}")
+                    self._log(f"\nSelecting address: {matched_option.text}")
+                    self._selected_address = matched_option.get_attribute("value")
                     matched_option.click()
-                    time.sleep(2)
                 else:
                     return {"error": "No addresses found for this postcode"}
                 
-                # Look for continue/submit button
-                continue_button = None
-                buttons = self.driver.find_elements(By.TAG_NAME, "button")
-                buttons.extend(self.driver.find_elements(By.CSS_SELECTOR, "input[type='submit']"))
-                
-                for btn in buttons:
-                    try:
-                        if btn.is_displayed():
-                            btn_text = (btn.text or "").lower()
-                            btn_value = (btn.get_attribute("value") or "").lower()
-                            
-                            if any(term in btn_text + btn_value for term in ["continue", "submit", "next", "view"]):
-                                continue_button = btn
-                                print(f"Found continue button: {btn.text or btn.get_attribute('value')}")
-                                break
-                    except:
-                        pass
+                # Look for continue/submit button, which may only appear once an
+                # address has been selected
+                try:
+                    continue_button = WebDriverWait(self.driver, 5).until(
+                        lambda d: self._find_button(["continue", "submit", "next", "view"])
+                    )
+                except TimeoutException:
+                    continue_button = None
                 
                 if continue_button:
-                    print("Submitting address selection...")
+                    self._log(f"Found continue button: {continue_button.text or continue_button.get_attribute('value')}")
+                    self._log("Submitting address selection...")
                     continue_button.click()
-                    time.sleep(3)
                 
             elif postcode_field and number_field:
                 # Single-step form
-                print(f"\nFilling in postcode: {postcode}")
+                self._log(f"\nFilling in postcode: {postcode}")
                 postcode_field.clear()
                 postcode_field.send_keys(postcode)
                 
-                print(f"Filling in street number: {street_number}")
+                self._log(f"Filling in street number: {street_number}")
                 number_field.clear()
                 number_field.send_keys(street_number)
                 
                 # Look for submit button
-                submit_button = None
-                buttons = self.driver.find_elements(By.TAG_NAME, "button")
-                buttons.extend(self.driver.find_elements(By.CSS_SELECTOR, "input[type='submit']"))
-                
-                for btn in buttons:
-                    btn_text = btn.text.lower()
-                    btn_value = btn.get_attribute("value")
-                    if btn_value:
-                        btn_text += " " + btn_value.lower()
-                    
-                    if any(term in btn_text for term in ["search", "submit", "find", "next", "continue"]):
-                        if btn.is_displayed():
-                            submit_button = btn
-                            print(f"Found submit button: {btn.text or btn.get_attribute('value')}")
-                            break
+                submit_button = self._find_button(["search", "submit", "find", "next", "continue"])
                 
                 if not submit_button:
                     return {"error": "Could not find submit button"}
                 
-                print("Submitting form...")
+                self._log(f"Found submit button: {submit_button.text or submit_button.get_attribute('value')}")
+                self._log("Submitting form...")
                 submit_button.click()
-                time.sleep(3)
             else:
                 return {
                     "error": "Could not identify form fields. The website structure may have changed.",
-                    "debug": f"Found {len(all_inputs)} inputs and {len(all_selects)} selects"
+                    "debug": f"Found {len(self.driver.find_elements(By.TAG_NAME, 'input'))} inputs and "
+                             f"{len(self.driver.find_elements(By.TAG_NAME, 'select'))} selects"
                 }
             
             # Try to extract results
-            print("Extracting results...")
-            
-            # Wait a bit more for JavaScript to populate the date fields
-            time.sleep(3)
+            self._log("Extracting results...")
             
-            # Extract bin collection dates directly from the form fields
-            schedule = {"collections": []}
+            # Wait for JavaScript to populate the date fields. If they never fill
+            # in, carry on so the fallback parsing below can look at the page.
+            try:
+                wait.until(self._dates_loaded)
+            except TimeoutException:
+                self._log("Timeout waiting for collection dates")
             
-            # Define bin types and their corresponding field patterns
-            bin_types = {
-                "Mixed Recycling": "RecyclingDate",
-                "Food & Garden Waste": "GardenDate",
-                "General Waste": "GeneralDate"
-            }
-            
-            for bin_name, field_prefix in bin_types.items():
-                dates = []
-                # Try to get up to 8 dates for each bin type
-                for i in range(1, 9):
-                    field_id = f"{field_prefix}{i}"
-                    try:
-                        element = self.driver.find_element(By.ID, field_id)
-                        date_value = element.get_attribute("value")
-                        if date_value and date_value.strip():
-                            dates.append(date_value.strip())
-                    except NoSuchElementException:
-                        continue
-                    except:
-                        break
-                
-                if dates:
-                    schedule["collections"].append({
-                        "bin_type": bin_name,
-                        "dates": dates
-                    })
+            # Extract bin collection dates directly from the form fields,
+            # reading the ids and values of all of them in one round-trip
+            selector = ", ".join(f"input[id^='{prefix}']" for prefix in self._BIN_FIELDS.values())
+            values = self.driver.execute_script(self._FIELD_VALUES_SCRIPT, selector)
+            schedule = self._schedule_from_fields(values)
             
             # Also try traditional parsing as fallback
             if not schedule.get("collections"):
-                page_source = self.driver.page_source
+                page_source = self.driver.execute_script(self._RESULTS_HTML_SCRIPT)
                 schedule = self.parse_results(page_source)
                 
-                # Get body text for debugging
-                try:
-                    body_text = self.driver.find_element(By.TAG_NAME, "body").text
-                    schedule["page_text"] = body_text[:2000]
-                except:
-                    pass
+                # Get body text for debugging, only when asked for as reading
+                # the rendered text is another full pass over the page
+                if self.debug:
+                    try:
+                        # Truncate in the browser so only what's kept is sent back
+                        schedule["page_text"] = self.driver.execute_script(
+                            "return (document.body.innerText || '').slice(0, 2000);"
+                        )
+                    except:
+                        pass
             
             return schedule
             
@@ -372,6 +1203,127 @@ class BinScheduleChecker:
         except Exception as e:
             return {"error": f"Unexpected error: {str(e)}", "type": type(e).__name__}
     
+    def _find_button(self, terms, match_id=False):
+        """
+        Find a visible button whose text or value contains one of the given terms.
+        
+        Args:
+            terms (list): Lowercase substrings to look for
+            match_id (bool): Also match the terms against the button's id. Only
+                the search step does this, since the search button stays on the
+                page and its id could otherwise match later steps' terms.
+            
+        Returns:
+            WebElement: The first matching button, or None
+        """
+        buttons = self.driver.execute_script(self._BUTTONS_SCRIPT, self._BUTTON_SELECTOR)
+        
+        for btn in buttons:
+            if btn["visible"]:
+                # Lowercase the attributes together, once per button
+                blob = f"{btn['text']} {btn['value']}"
+                if match_id:
+                    blob += f" {btn['id']}"
+                blob = blob.lower()
+                if any(term in blob for term in terms):
+                    return btn["element"]
+        
+        return None
+    
+    def _schedule_from_fields(self, values):
+        """
+        Build a schedule from the values of the numbered date fields.
+        
+        Args:
+            values (dict): Field values keyed by field id, e.g. "RecyclingDate1"
+            
+        Returns:
+            dict: Schedule with a list of dates for each bin type that has any
+        """
+        schedule = {"collections": []}
+        
+        for bin_name, field_prefix in self._BIN_FIELDS.items():
+            dates = []
+            # Try to get up to 8 dates for each bin type
+            for i in range(1, 9):
+                date_value = values.get(f"{field_prefix}{i}")
+                if date_value and date_value.strip():
+                    dates.append(date_value.strip())
+            
+            if dates:
+                schedule["collections"].append({
+                    "bin_type": bin_name,
+                    "dates": dates
+                })
+        
+        return schedule
+    
+    @staticmethod
+    def _addresses_loaded(driver):
+        """Wait condition: true once a visible select has options beyond the placeholder."""
+        return driver.execute_script(
+            BinScheduleChecker._VISIBLE_JS
+            + "return Array.from(document.querySelectorAll('select'))"
+            ".some(s => isVisible(s) && s.options.length > 1);"
+        )
+    
+    @staticmethod
+    def _dates_loaded(driver):
+        """Wait condition: true once any of the first collection date fields has a value."""
+        fields = driver.find_elements(By.CSS_SELECTOR, "#RecyclingDate1, #GardenDate1, #GeneralDate1")
+        try:
+            return any(field.get_attribute("value") for field in fields)
+        except StaleElementReferenceException:
+            # The form re-rendered between the lookup and the read; poll again
+            return False
+    
+    def get_many(self, pairs, workers=4):
+        """
+        Retrieve bin collection schedules for several addresses.
+        
+        A WebDriver can only serve one thread, so when more than one worker is
+        used each worker thread gets its own checker and browser. The browsers
+        are closed once all lookups have finished, or returned to the pool if
+        this checker has one. Each concurrent lookup that misses the cache
+        starts after a short random delay so the council site isn't sent a
+        burst of identical requests.
+        
+        Args:
+            pairs (list): (postcode, street_number) tuples to look up
+            workers (int): Maximum number of lookups to run at once
+            
+        Returns:
+            list: Bin collection schedule dicts, in the same order as pairs
+        """
+        if workers <= 1 or len(pairs) <= 1:
+            return [self.get_bin_schedule(postcode, street_number) for postcode, street_number in pairs]
+        
+        local = threading.local()
+        checkers = []
+        lock = threading.Lock()
+        
+        def lookup(pair):
+            checker = getattr(local, "checker", None)
+            if checker is None:
+                checker = BinScheduleChecker(headless=self.headless, verbose=self.verbose,
+                                             cache_ttl=self.cache_ttl, pool=self.pool, debug=self.debug,
+                                             use_api=self.use_api, delay=0.2)
+                # Each worker updates its own copy of the layout, e.g. when it
+                # finds the address select, rather than one shared dict
+                if self._form_cache is not None:
+                    checker._form_cache = dict(self._form_cache)
+                with lock:
+                    checkers.append(checker)
+                local.checker = checker
+            return checker.get_bin_schedule(*pair)
+        
+        try:
+            with ThreadPoolExecutor(max_workers=min(workers, len(pairs))) as executor:
+                return list(executor.map(lookup, pairs))
+        finally:
+            for checker in checkers:
+                checker.close_driver()
+    
     def parse_results(self, html):
         """
         Parse bin collection schedule from the results page.
@@ -382,100 +1334,128 @@ class BinScheduleChecker:
         Returns:
             dict: Parsed schedule information
         """
-        from bs4 import BeautifulSoup
-        import re
-        
-        soup = BeautifulSoup(html, 'html.parser')
-        
         schedule = {
             "collections": [],
             "raw_text": []
         }
         
-        # Look for date patterns in the HTML
-        # Common date formats: DD/MM/YYYY, DD-MM-YYYY, Monday DD Month YYYY, etc.
-        date_pattern = r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b|\b\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4}\b|\b(?:Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)\s+\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4}\b'
-        
-        # Look for elements that pair bin types with dates
-        bin_keywords = ['recycling', 'waste', 'garden', 'food', 'general', 'mixed', 'glass']
-        
-        # Check all text nodes for bin type + date combinations
-        for element in soup.find_all(['div', 'span', 'p', 'td', 'li', 'label']):
-            text = element.get_text(strip=True)
-            
-            # Check if this element contains a bin keyword
-            for keyword in bin_keywords:
-                if keyword in text.lower() and len(text) < 100:
-                    # Look for dates in this element or nearby elements
-                    dates = re.findall(date_pattern, text, re.IGNORECASE)
-                    if dates:
-                        schedule["collections"].append({
-                            "bin_type": text,
-                            "date": ', '.join(dates)
-                        })
-                        break
+        # Plain etree elements are all the walk below needs. lxml.html's
+        # HtmlElement classes would add a Python-level class lookup for every
+        # element proxy it creates.
+        doc = etree.HTML(html)
+        if doc is None:
+            # Empty document, nothing to extract
+            return schedule
         
-        # Look for input fields with date values (common in forms)
-        for input_field in soup.find_all('input'):
-            field_id = input_field.get('id', '')
-            field_name = input_field.get('name', '')
-            field_value = input_field.get('value', '')
-            
-            # Check if this looks like a date field for a bin
-            if any(keyword in field_id.lower() + field_name.lower() for keyword in bin_keywords):
-                if field_value and re.search(date_pattern, field_value, re.IGNORECASE):
-                    # Find the label for this field
-                    label = soup.find('label', {'for': field_id})
-                    if label:
-                        bin_type = label.get_text(strip=True)
-                    else:
-                        bin_type = field_id.replace('_', ' ').title()
-                    
-                    schedule["collections"].append({
-                        "bin_type": bin_type,
-                        "date": field_value
-                    })
-        
-        # Look for tables
-        tables = soup.find_all('table')
-        for table in tables:
-            rows = table.find_all('tr')
-            for row in rows[1:]:  # Skip header
-                cells = row.find_all(['td', 'th'])
-                if len(cells) >= 2:
-                    text1 = cells[0].get_text(strip=True)
-                    text2 = cells[1].get_text(strip=True)
-                    if text1 and text2 and any(keyword in text1.lower() for keyword in bin_keywords):
-                        schedule["collections"].append({
-                            "bin_type": text1,
-                            "date": text2
-                        })
-        
-        # Look for lists
-        lists = soup.find_all(['ul', 'ol', 'dl'])
-        for lst in lists:
-            items = lst.find_all(['li', 'dt', 'dd'])
-            for item in items:
-                text = item.get_text(strip=True)
-                if text and len(text) > 5:
-                    schedule["raw_text"].append(text)
-        
-        # Look for divs with specific classes that might contain schedule info
-        for div in soup.find_all('div'):
-            text = div.get_text(strip=True)
-            if any(keyword in text.lower() for keyword in ['bin', 'collection', 'waste', 'recycling']):
-                if len(text) > 10 and len(text) < 200:
-                    schedule["raw_text"].append(text)
-        
-        # Deduplicate collections
-        seen = set()
-        unique_collections = []
-        for col in schedule["collections"]:
-            key = (col["bin_type"].lower(), col["date"].lower())
-            if key not in seen:
-                seen.add(key)
-                unique_collections.append(col)
-        schedule["collections"] = unique_collections
+        # Drop script and style blocks (often the bulk of the page) and the head
+        # up front, so their contents never end up in extracted text or get
+        # walked below. Only the body can hold a schedule.
+        etree.strip_elements(doc, 'head', 'script', 'style', with_tail=False)
+        
+        # Let libxml2 find the tables that mention a bin at all, so rows of
+        # navigation and layout tables are skipped without extracting their cells
+        bin_tables = set(self._BIN_TABLE_XP(doc))
+        
+        # Walk the document once, dispatching on each element's tag. Matches are
+        # kept in separate lists so the output order is the same as scanning
+        # text elements, inputs, tables, lists and divs one after another.
+        # Collections are keyed on their lowercased type and date, so repeats
+        # are dropped as they are found.
+        text_collections = {}
+        input_collections = {}
+        table_collections = {}
+        list_text = []
+        div_text = []
+        header_seen = set()
+        labels = None
+        
+        for element in doc.iter(*self._PARSED_TAGS):
+            tag = element.tag
+            if tag in self._TEXT_TAGS:
+                text = _text(element, None if tag == 'li' else self._TEXT_LIMIT)
+            else:
+                text = None
+            
+            # Look for elements that pair bin types with dates
+            if text is not None and len(text) < 100 and self._BIN_RE.search(text):
+                dates = _DATE_RE.findall(text)
+                if dates:
+                    _add_collection(text_collections, text, ', '.join(dates))
+            
+            if tag == 'input':
+                # Look for input fields with date values (common in forms)
+                field_id = element.get('id', '')
+                field_name = element.get('name', '')
+                field_value = element.get('value', '')
+                
+                # Check if this looks like a date field for a bin
+                if self._BIN_RE.search(field_id) or self._BIN_RE.search(field_name):
+                    if field_value and _DATE_RE.search(field_value):
+                        # Find the label for this field. Labels can come after
+                        # their input, so index them all the first time one is needed
+                        # rather than searching the document for every input.
+                        if labels is None:
+                            labels = {}
+                            for label in doc.iter('label'):
+                                labels.setdefault(label.get('for'), label)
+                        label = labels.get(field_id)
+                        if label is not None:
+                            bin_type = _text(label)
+                        else:
+                            bin_type = field_id.replace('_', ' ').title()
+                        
+                        _add_collection(input_collections, bin_type, field_value)
+            
+            elif tag == 'tr':
+                # Look for tables, skipping the first (header) row of each one
+                table = next(element.iterancestors('table'), None)
+                if table is None:
+                    continue
+                if table not in header_seen:
+                    header_seen.add(table)
+                    continue
+                if table not in bin_tables:
+                    continue
+                
+                # Only the first two cells are used, and the second is only read
+                # once the first has been found to name a bin
+                cells = list(islice(element.iterchildren('td', 'th'), 2))
+                if len(cells) == 2:
+                    text1 = _text(cells[0])
+                    if text1 and self._BIN_RE.search(text1):
+                        text2 = _text(cells[1])
+                        if text2:
+                            _add_collection(table_collections, text1, text2)
+            
+            elif tag in ('li', 'dt', 'dd'):
+                # Look for list items
+                if next(element.iterancestors('ul', 'ol', 'dl'), None) is not None:
+                    if text is None:
+                        text = _text(element)
+                    if text and len(text) > 5:
+                        list_text.append(text)
+            
+            elif tag == 'div':
+                # Look for divs that might contain schedule info
+                if len(text) > 10 and len(text) < 200 and self._SCHEDULE_DIV_RE.search(text):
+                    div_text.append(text)
+        
+        # Combine in scan order; a collection found by more than one scan is
+        # kept from the first
+        collections = {}
+        for found in (text_collections, input_collections, table_collections):
+            for key, col in found.items():
+                collections.setdefault(key, col)
+        
+        # Nothing paired a bin type with a date, so report any dates in the page
+        # text rather than leaving the reader to pick them out of raw_text
+        if not collections:
+            page_text = " ".join(doc.itertext())
+            for match in _DATE_RE.finditer(page_text):
+                _add_collection(collections, "Date found on page", match.group(0))
+        
+        schedule["collections"] = list(collections.values())
+        schedule["raw_text"] = list_text + div_text
         
         return schedule
     
@@ -486,17 +1466,32 @@ class BinScheduleChecker:
         Args:
             schedule (dict): The bin collection schedule
         """
+        # Written in one call rather than a print per line
+        sys.stdout.write(self.format_schedule(schedule))
+    
+    def format_schedule(self, schedule):
+        """
+        Format the bin collection schedule for display.
+        
+        Args:
+            schedule (dict): The bin collection schedule
+            
+        Returns:
+            str: The formatted schedule, ending with a newline
+        """
         from datetime import datetime
         
+        lines = []
+        
         if "error" in schedule:
-            print(f"\n❌ Error: {schedule['error']}")
+            lines.append(f"\n❌ Error: {schedule['error']}")
             if "debug" in schedule:
-                print(f"Debug info: {schedule['debug']}")
-            return
+                lines.append(f"Debug info: {schedule['debug']}")
+            return "\n".join(lines) + "\n"
         
-        print("\n" + "="*50)
-        print("BIN COLLECTION SCHEDULE")
-        print("="*50)
+        lines.append("\n" + "="*50)
+        lines.append("BIN COLLECTION SCHEDULE")
+        lines.append("="*50)
         
         if schedule.get("collections"):
             # Find the next collection across all bin types
@@ -520,76 +1515,155 @@ class BinScheduleChecker:
             
             # Display next collection prominently
             if next_collection:
-                print(f"\n🔔 YOUR NEXT COLLECTION:")
-                print("="*50)
-                print(f"   {next_collection['bin_type']}")
-                print(f"   {next_collection['date']}")
-                print("="*50)
-            
-            print("\n📅 All Upcoming Collections:")
-            print("-"*50)
+                lines.append(f"\n🔔 YOUR NEXT COLLECTION:")
+                lines.append("="*50)
+                lines.append(f"   {next_collection['bin_type']}")
+                lines.append(f"   {next_collection['date']}")
+                lines.append("="*50)
+            
+            lines.append("\n📅 All Upcoming Collections:")
+            lines.append("-"*50)
             for collection in schedule["collections"]:
                 if "dates" in collection:
                     # Multiple dates format
-                    print(f"\n🗑️  {collection['bin_type']}:")
+                    lines.append(f"\n🗑️  {collection['bin_type']}:")
                     for date in collection["dates"]:
-                        print(f"    • {date}")
+                        lines.append(f"    • {date}")
                 elif "date" in collection:
                     # Single date format
-                    print(f"  • {collection['bin_type']}: {collection['date']}")
+                    lines.append(f"  • {collection['bin_type']}: {collection['date']}")
         
         if schedule.get("raw_text"):
-            print("\n📄 Additional Information:")
-            print("-"*50)
+            lines.append("\n📄 Additional Information:")
+            lines.append("-"*50)
             for text in schedule["raw_text"][:10]:  # Limit to first 10 items
-                print(f"  • {text}")
+                lines.append(f"  • {text}")
         
         if schedule.get("page_text"):
-            print("\n📄 Page Content:")
-            print("-"*50)
-            print(schedule["page_text"][:500])
-            print("...")
+            lines.append("\n📄 Page Content:")
+            lines.append("-"*50)
+            lines.append(schedule["page_text"][:500])
+            lines.append("...")
         
         if schedule.get("addresses"):
-            print("\n📍 Available Addresses:")
-            print("-"*50)
+            lines.append("\n📍 Available Addresses:")
+            lines.append("-"*50)
             for i, addr in enumerate(schedule["addresses"][:10], 1):
-                print(f"  {i}. {addr}")
+                lines.append(f"  {i}. {addr}")
         
         if not schedule.get("collections") and not schedule.get("raw_text") and not schedule.get("page_text"):
-            print("\n⚠️  No collection information found.")
-            print("Please verify your postcode and street number are correct.")
+            lines.append("\n⚠️  No collection information found.")
+            lines.append("Please verify your postcode and street number are correct.")
+        
+        lines.append("="*50 + "\n")
         
-        print("="*50 + "\n")
+        return "\n".join(lines) + "\n"
+
+
+def read_addresses(stream):
+    """
+    Read addresses to look up, one "street_number postcode" pair per line.
+    
+    Args:
+        stream: File-like object to read from
+        
+    Returns:
+        list: (postcode, street_number) tuples, blank lines skipped
+    """
+    pairs = []
+    for line in stream:
+        parts = line.split(None, 1)
+        if len(parts) == 2:
+            pairs.append((parts[1].strip().upper(), parts[0]))
+    return pairs
 
 
 def main():
     """Main function to run the bin schedule checker."""
-    print("Aberdeen City Council - Bin Collection Schedule Checker")
-    print("-" * 55)
+    parser = argparse.ArgumentParser(description="Look up Aberdeen City Council bin collection dates.")
+    parser.add_argument("street_number", nargs="?", help="Street number, e.g. 123")
+    parser.add_argument("postcode", nargs="?", help="Postcode, e.g. 'AB10 1AB'")
+    parser.add_argument("--json", action="store_true",
+                        help="Print the schedule as JSON instead of formatted text")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of browsers to look up addresses from stdin with at once")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always query the website instead of using a cached schedule")
+    parser.add_argument("--debug", action="store_true",
+                        help="Include the page text in the output when no dates are found")
+    parser.add_argument("--capture-api", action="store_true",
+                        help="Look up the address in the browser and save the form's API calls "
+                             "for --use-api")
+    parser.add_argument("--use-api", action="store_true",
+                        help="Try replaying the saved API calls over HTTP before starting Chrome "
+                             "(experimental)")
+    parser.add_argument("--chromedriver-refresh", action="store_true",
+                        help="Ask webdriver-manager for ChromeDriver again instead of using the cached path")
+    args = parser.parse_args()
+    
+    if args.street_number and not args.postcode:
+        parser.error("a postcode is required when a street number is given")
+    
+    if not args.json:
+        print("Aberdeen City Council - Bin Collection Schedule Checker")
+        print("-" * 55)
+    
+    if args.chromedriver_refresh:
+        chromedriver_path(refresh=True)
+    
+    # Under --json stdout only carries the schedules, so prompts and
+    # messages go to stderr
+    messages = sys.stderr if args.json else sys.stdout
     
     # Get user input
-    if len(sys.argv) == 3:
-        street_number = sys.argv[1]
-        postcode = sys.argv[2]
+    if args.street_number and args.postcode:
+        pairs = [(args.postcode, args.street_number)]
+    elif not sys.stdin.isatty():
+        # Addresses piped in on stdin are looked up in one browser
+        pairs = read_addresses(sys.stdin)
     else:
-        print("\nPlease enter your details:")
-        street_number = input("Street Number: ").strip()
-        postcode = input("Postcode (e.g., AB10 1AB): ").strip().upper()
+        print("\nPlease enter your details:", file=messages)
+        print("Street Number: ", end="", file=messages, flush=True)
+        street_number = input().strip()
+        print("Postcode (e.g., AB10 1AB): ", end="", file=messages, flush=True)
+        postcode = input().strip().upper()
+        pairs = [(postcode, street_number)] if street_number and postcode else []
     
-    if not street_number or not postcode:
-        print("\n❌ Error: Both street number and postcode are required.")
+    if not pairs:
+        print("\n❌ Error: Both street number and postcode are required.", file=sys.stderr)
         sys.exit(1)
     
+    if args.capture_api:
+        pool = BrowserPool(size=1, headless=True, log_network=True)
+        checker = BinScheduleChecker(headless=True, verbose=not args.json, pool=pool, cache_ttl=0)
+        try:
+            captured = checker.capture_api_calls(*pairs[0])
+        finally:
+            checker.close_driver()
+            pool.close()
+        if not captured:
+            print("\n❌ Error: Could not capture the form's API calls.", file=sys.stderr)
+            sys.exit(1)
+        print("\n✓ API calls saved; run with --use-api to try them before starting Chrome.", file=messages)
+        return
+    
     # Create checker and run
-    checker = BinScheduleChecker(headless=True)
+    # Keep a browser per worker; a single worker leaves the size to POOL_SIZE
+    pool = BrowserPool(size=args.workers if args.workers > 1 else None, headless=True)
+    checker = BinScheduleChecker(headless=True, verbose=not args.json, pool=pool, debug=args.debug,
+                                 cache_ttl=0 if args.no_cache else RESULT_CACHE_TTL, use_api=args.use_api)
     
     try:
-        checker.setup_driver()
-        schedule = checker.get_bin_schedule(postcode, street_number)
-        checker.display_schedule(schedule)
+        schedules = checker.get_many(pairs, workers=args.workers)
+        if args.json:
+            output = schedules[0] if len(schedules) == 1 else schedules
+            print(json.dumps(output, indent=2, ensure_ascii=False))
+        else:
+            for schedule in schedules:
+                checker.display_schedule(schedule)
     finally:
         checker.close_driver()
+        pool.close()
 
 
 if __name__ == "__main__":
@@ -3,83 +3,175 @@
 Test script to inspect the Aberdeen City Council bin collection form
 """
 
+from urllib.parse import urljoin
+import re
+
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree
 
 
-def inspect_form():
-    """Inspect the form structure on the Aberdeen City Council website."""
-    url = "https://integration.aberdeencity.gov.uk/service/bin_collection_calendar___view"
+# Quoted URLs in scripts that point at the form platform's lookup API
+API_ENDPOINT_RE = re.compile(r'''["']([^"'\s]*apibroker[^"'\s]*)["']''')
+
+
+def create_session():
+    """Create a requests session that reuses connections and retries transient errors."""
+    session = requests.Session()
+    session.headers.update({
+        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+    })
     
-    print(f"Fetching form from: {url}\n")
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=32,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+    )
+    session.mount('https://', adapter)
+    return session
+
+
+def fetch_elements(session, url, tags=('form', 'script', 'iframe'), chunk_size=16384):
+    """
+    Stream a page into lxml's incremental parser and collect the elements of interest.
     
-    try:
-        session = requests.Session()
-        session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        })
-        
-        response = session.get(url)
+    The body is fed to the parser chunk by chunk as it arrives, so it is never
+    buffered and decoded as a whole before parsing starts. A gzip-encoded body
+    is decompressed incrementally by requests on the way through.
+    
+    Returns:
+        dict: Lists of parsed elements keyed by tag name, in document order
+    """
+    found = {tag: [] for tag in tags}
+    
+    with session.get(url, stream=True) as response:
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        # The raw bytes go straight to libxml2, which detects the charset from
+        # the page's <meta> tag. Only a charset the server actually declared is
+        # passed on, as requests otherwise assumes ISO-8859-1 for text/html.
+        content_type = response.headers.get('Content-Type', '').lower()
+        encoding = response.encoding if 'charset=' in content_type else None
+        parser = etree.HTMLPullParser(events=('end',), tag=tags, encoding=encoding)
         
-        # Find all forms
-        forms = soup.find_all('form')
-        print(f"Found {len(forms)} form(s)\n")
+        for chunk in response.iter_content(chunk_size):
+            parser.feed(chunk)
+            for _, element in parser.read_events():
+                found[element.tag].append(element)
+    
+    parser.close()
+    for _, element in parser.read_events():
+        found[element.tag].append(element)
+    
+    return found
+
+
+def element_text(element):
+    """Return all text inside an element."""
+    return ''.join(element.itertext())
+
+
+def inspect_page(session, url):
+    """
+    Print the forms, scripts and iframes found on a page.
+    
+    Returns:
+        list: Absolute URLs of the page's iframes
+    """
+    elements = fetch_elements(session, url)
+    
+    # Find all forms
+    forms = elements['form']
+    print(f"Found {len(forms)} form(s)\n")
+    
+    for i, form in enumerate(forms, 1):
+        print(f"=== FORM {i} ===")
+        print(f"Action: {form.get('action', 'N/A')}")
+        print(f"Method: {form.get('method', 'N/A')}")
+        print(f"ID: {form.get('id', 'N/A')}")
+        print(f"Class: {form.get('class', 'N/A')}")
+        print("\nForm Fields:")
         
-        for i, form in enumerate(forms, 1):
-            print(f"=== FORM {i} ===")
-            print(f"Action: {form.get('action', 'N/A')}")
-            print(f"Method: {form.get('method', 'N/A')}")
-            print(f"ID: {form.get('id', 'N/A')}")
-            print(f"Class: {form.get('class', 'N/A')}")
-            print("\nForm Fields:")
+        # Find all input fields
+        inputs = form.iter('input', 'select', 'textarea')
+        for inp in inputs:
+            tag = inp.tag
+            field_type = inp.get('type', 'text')
+            field_name = inp.get('name', 'N/A')
+            field_id = inp.get('id', 'N/A')
+            field_value = inp.get('value', '')
+            field_placeholder = inp.get('placeholder', '')
             
-            # Find all input fields
-            inputs = form.find_all(['input', 'select', 'textarea'])
-            for inp in inputs:
-                tag = inp.name
-                field_type = inp.get('type', 'text')
-                field_name = inp.get('name', 'N/A')
-                field_id = inp.get('id', 'N/A')
-                field_value = inp.get('value', '')
-                field_placeholder = inp.get('placeholder', '')
-                
-                print(f"  - <{tag}> type='{field_type}' name='{field_name}' id='{field_id}'")
-                if field_value:
-                    print(f"    value: '{field_value}'")
-                if field_placeholder:
-                    print(f"    placeholder: '{field_placeholder}'")
-                
-                # For select fields, show options
-                if tag == 'select':
-                    options = inp.find_all('option')
-                    if options:
-                        print(f"    options: {[opt.get('value', opt.get_text(strip=True)) for opt in options[:5]]}")
+            print(f"  - <{tag}> type='{field_type}' name='{field_name}' id='{field_id}'")
+            if field_value:
+                print(f"    value: '{field_value}'")
+            if field_placeholder:
+                print(f"    placeholder: '{field_placeholder}'")
             
-            print("\n" + "-"*50 + "\n")
+            # For select fields, show options
+            if tag == 'select':
+                options = inp.findall('.//option')
+                if options:
+                    print(f"    options: {[opt.get('value', element_text(opt).strip()) for opt in options[:5]]}")
         
-        # Also look for any javascript or data attributes that might indicate API endpoints
-        scripts = soup.find_all('script')
-        print(f"Found {len(scripts)} script tag(s)")
-        
-        # Look for form definition or API endpoints
-        for script in scripts:
-            script_text = script.get_text()
-            if 'FormDefinition' in script_text or 'form_uri' in script_text:
-                print(f"\n=== Form Definition Found ===")
-                print(script_text[:1000])
-                print("...")
-                print()
+        print("\n" + "-"*50 + "\n")
+    
+    # Also look for any javascript or data attributes that might indicate API endpoints
+    scripts = elements['script']
+    print(f"Found {len(scripts)} script tag(s)")
+    
+    # Look for form definition or API endpoints
+    endpoints = []
+    for script in scripts:
+        script_text = element_text(script)
+        if 'FormDefinition' in script_text or 'form_uri' in script_text:
+            print(f"\n=== Form Definition Found ===")
+            print(script_text[:1000])
+            print("...")
+            print()
+        for endpoint in API_ENDPOINT_RE.findall(script_text):
+            if endpoint not in endpoints:
+                endpoints.append(endpoint)
+    
+    if endpoints:
+        print(f"\nPossible API endpoints referenced by scripts:")
+        for endpoint in endpoints:
+            print(f"  - {urljoin(url, endpoint)}")
+    else:
+        # The form's iframe and its API calls are added by JavaScript, so they
+        # usually aren't in the HTML the server sends
+        print("\nNo API endpoints found in the page source. To record the calls the")
+        print("rendered form makes, run: python bin_schedule_selenium.py --capture-api")
+    
+    # Look for iframes
+    iframes = elements['iframe']
+    print(f"\nFound {len(iframes)} iframe(s)")
+    for iframe in iframes:
+        print(f"  - src: {iframe.get('src', 'N/A')}")
+        print(f"    id: {iframe.get('id', 'N/A')}")
+        print(f"    class: {iframe.get('class', 'N/A')}")
+    
+    # Return the frames' documents so the caller can inspect the embedded form too
+    frame_urls = [urljoin(url, iframe.get('src')) for iframe in iframes if iframe.get('src')]
+    return [frame_url for frame_url in frame_urls if frame_url.startswith('http')]
+
+
+def inspect_form():
+    """Inspect the form structure on the Aberdeen City Council website."""
+    url = "https://integration.aberdeencity.gov.uk/service/bin_collection_calendar___view"
+    
+    print(f"Fetching form from: {url}\n")
+    
+    try:
+        session = create_session()
+        frame_urls = inspect_page(session, url)
         
-        # Look for iframes
-        iframes = soup.find_all('iframe')
-        print(f"\nFound {len(iframes)} iframe(s)")
-        for iframe in iframes:
-            print(f"  - src: {iframe.get('src', 'N/A')}")
-            print(f"    id: {iframe.get('id', 'N/A')}")
-            print(f"    class: {iframe.get('class', 'N/A')}")
+        # The form itself is rendered inside an iframe, so inspect each frame's
+        # document as well to find the endpoints the form submits to
+        for frame_url in frame_urls:
+            print(f"\n{'=' * 50}\nFetching iframe: {frame_url}\n")
+            inspect_page(session, frame_url)
         
     except Exception as e:
         print(f"Error: {e}")
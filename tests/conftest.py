@@ -0,0 +1,37 @@
+"""
+Shared pytest fixtures for the bin schedule checker tests
+"""
+
+from pathlib import Path
+import sys
+
+import pytest
+
+# The scripts live in the repository root rather than in a package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import bin_schedule_selenium
+
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Point the checker's on-disk caches at a temporary directory."""
+    monkeypatch.setattr(bin_schedule_selenium, "CACHE_DIR", tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def checker(cache_dir):
+    """A checker with no browser, using a temporary cache directory."""
+    return bin_schedule_selenium.BinScheduleChecker()
+
+
+@pytest.fixture
+def load_fixture():
+    """Return a function that reads a saved HTML page from tests/fixtures."""
+    def load(name):
+        return (FIXTURES_DIR / name).read_text(encoding="utf-8")
+    return load
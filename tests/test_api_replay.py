@@ -0,0 +1,143 @@
+"""
+Tests for replaying captured form API calls over HTTP
+"""
+
+import json
+
+import bin_schedule_selenium
+from bin_schedule_selenium import BinScheduleChecker
+
+
+SERVICE_URL = "https://integration.aberdeencity.gov.uk/service/bin_collection_calendar___view"
+AUTH_URL = "https://integration.aberdeencity.gov.uk/authapi/isauthenticated?uri=x"
+LOOKUP_URL = "https://integration.aberdeencity.gov.uk/apibroker/runLookup?id=abc&sid=old&_=1"
+DATES_URL = "https://integration.aberdeencity.gov.uk/apibroker/runLookup?id=def&sid=old&_=1"
+
+
+def address_rows(*rows):
+    """An address lookup response in the platform's rows_data shape."""
+    return {"integration": {"transformed": {"rows_data": {
+        str(i): {"uprn": uprn, "display": display} for i, (uprn, display) in enumerate(rows)
+    }}}}
+
+
+CAPTURE = {
+    "url": SERVICE_URL,
+    "postcode": "AB10 1AB",
+    "address": "9000001",
+    "calls": [
+        {"url": AUTH_URL, "method": "GET", "body": None, "response": None},
+        {"url": LOOKUP_URL, "method": "POST",
+         "body": json.dumps({"formValues": {"postcode": {"value": "AB10 1AB"}}}),
+         "response": address_rows(("9000001", "1 Example Street, Aberdeen"))},
+        {"url": DATES_URL, "method": "POST",
+         "body": json.dumps({"formValues": {"uprn": {"value": "9000001"}}}),
+         "response": None},
+    ]
+}
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+    
+    def raise_for_status(self):
+        pass
+    
+    def json(self):
+        return self.data
+
+
+class FakeSession:
+    """Answers the platform's endpoints and records what was sent to them."""
+    
+    def __init__(self, addresses, auth=None):
+        self.headers = {}
+        self.sent = []
+        self.addresses = addresses
+        self.auth = {"auth-session": "new-session"} if auth is None else auth
+    
+    def get(self, url, **kwargs):
+        return FakeResponse(self.auth)
+    
+    def request(self, method, url, data=None, **kwargs):
+        self.sent.append((url, data))
+        if "id=abc" in url:
+            return FakeResponse(self.addresses)
+        return FakeResponse({"integration": {"transformed": {"rows_data": {"0": {
+            "RecyclingDate1": "03/03/2025",
+            "RecyclingDate2": "17/03/2025",
+            "GeneralDate1": "10/03/2025",
+            "GardenDate1": ""
+        }}}}})
+    
+    def close(self):
+        pass
+
+
+def use_capture(cache_dir, monkeypatch, addresses, auth=None, capture=CAPTURE):
+    """Save a capture to the cache and serve requests from a FakeSession."""
+    (cache_dir / "api.json").write_text(json.dumps(capture))
+    session = FakeSession(addresses, auth)
+    monkeypatch.setattr(bin_schedule_selenium, "create_session", lambda: session)
+    return session
+
+
+def test_replay_swaps_in_the_new_address(cache_dir, monkeypatch):
+    """The postcode, address id and session id of the captured calls are replaced."""
+    session = use_capture(cache_dir, monkeypatch, address_rows(
+        ("9000020", "12 Other Road, Aberdeen"),
+        ("9000021", "14 Other Road, Aberdeen"),
+    ))
+    
+    schedule = BinScheduleChecker()._lookup_via_api("AB11 5XY", "14")
+    
+    assert schedule == {"collections": [
+        {"bin_type": "Mixed Recycling", "dates": ["03/03/2025", "17/03/2025"]},
+        {"bin_type": "General Waste", "dates": ["10/03/2025"]},
+    ]}
+    (lookup_url, lookup_body), (dates_url, dates_body) = session.sent
+    assert json.loads(lookup_body) == {"formValues": {"postcode": {"value": "AB11 5XY"}}}
+    assert "sid=new-session" in lookup_url
+    assert json.loads(dates_body) == {"formValues": {"uprn": {"value": "9000021"}}}
+
+
+def test_unknown_street_number_falls_back(cache_dir, monkeypatch):
+    """An address missing from the lookup response leaves the lookup to the browser."""
+    session = use_capture(cache_dir, monkeypatch, address_rows(("9000020", "12 Other Road, Aberdeen")))
+    
+    assert BinScheduleChecker()._lookup_via_api("AB11 5XY", "14") is None
+    assert len(session.sent) == 1
+
+
+def test_non_dict_auth_response_falls_back(cache_dir, monkeypatch):
+    """An auth response that isn't a JSON object doesn't break the lookup."""
+    use_capture(cache_dir, monkeypatch, address_rows(("9000021", "14 Other Road, Aberdeen")),
+                auth=["unexpected"])
+    
+    schedule = BinScheduleChecker()._lookup_via_api("AB11 5XY", "14")
+    
+    assert schedule["collections"][0]["dates"] == ["03/03/2025", "17/03/2025"]
+
+
+def test_address_id_never_sent_falls_back(cache_dir, monkeypatch):
+    """If the captured address id isn't in any request, the replay isn't trusted."""
+    capture = dict(CAPTURE, calls=CAPTURE["calls"][:2])
+    use_capture(cache_dir, monkeypatch, address_rows(("9000021", "14 Other Road, Aberdeen")),
+                capture=capture)
+    
+    assert BinScheduleChecker()._lookup_via_api("AB11 5XY", "14") is None
+
+
+def test_only_whole_values_are_replaced():
+    """Ids inside longer values or keys are left alone."""
+    value, count = bin_schedule_selenium._replace_json_values(
+        {"uprn": 9000001, "ref": "90000012", "9000001": "x"}, "9000001", "9000021")
+    
+    assert value == {"uprn": 9000021, "ref": "90000012", "9000001": "x"}
+    assert count == 1
+
+
+def test_no_capture_means_no_api_lookup(cache_dir):
+    """Without saved API calls the browser is used."""
+    assert BinScheduleChecker()._lookup_via_api("AB10 1AB", "1") is None
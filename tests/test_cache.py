@@ -0,0 +1,54 @@
+"""
+Tests for the on-disk schedule cache
+"""
+
+import json
+import time
+
+from bin_schedule_selenium import BinScheduleChecker
+
+
+SCHEDULE = {"collections": [{"bin_type": "General Waste", "dates": ["10/03/2025"]}]}
+
+
+def write_cache_entry(checker, written, schedule=SCHEDULE):
+    """Store a schedule for 7 AB10 1AB as if it had been cached at the given time."""
+    path = checker._cache_path("AB10 1AB", "7")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"time": written, "schedule": schedule}))
+
+
+def test_cached_schedule_is_used_within_ttl(cache_dir):
+    """A cached schedule younger than the TTL is returned."""
+    checker = BinScheduleChecker(cache_ttl=60)
+    write_cache_entry(checker, time.time() - 30)
+    
+    # Keys are normalised, so a different spelling of the postcode also hits
+    assert checker._read_cached_schedule("ab101ab", "7") == SCHEDULE
+
+
+def test_cached_schedule_expires_after_ttl(cache_dir):
+    """A cached schedule older than the TTL is a miss."""
+    checker = BinScheduleChecker(cache_ttl=60)
+    write_cache_entry(checker, time.time() - 61)
+    
+    assert checker._read_cached_schedule("AB10 1AB", "7") is None
+
+
+def test_cache_disabled_with_zero_ttl(cache_dir):
+    """A TTL of 0 turns the cache off."""
+    checker = BinScheduleChecker(cache_ttl=0)
+    write_cache_entry(checker, time.time())
+    
+    assert checker._read_cached_schedule("AB10 1AB", "7") is None
+
+
+def test_malformed_cache_entry_is_a_miss(cache_dir):
+    """Files that aren't cache entries are treated as misses instead of raising."""
+    checker = BinScheduleChecker(cache_ttl=60)
+    path = checker._cache_path("AB10 1AB", "7")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    
+    for content in ("[1, 2]", "null", "5", "not json"):
+        path.write_text(content)
+        assert checker._read_cached_schedule("AB10 1AB", "7") is None
@@ -0,0 +1,66 @@
+"""
+Tests for BinScheduleChecker.parse_results against saved result pages
+"""
+
+
+def test_table_layout(checker, load_fixture):
+    """Rows of a table naming a bin pair the bin with the date in the next cell."""
+    schedule = checker.parse_results(load_fixture("table_layout.html"))
+    
+    # The navigation table has no bin keywords and each header row is skipped
+    assert schedule["collections"] == [
+        {"bin_type": "Mixed Recycling", "date": "Monday 3 March 2025"},
+        {"bin_type": "General Waste", "date": "Monday 10 March 2025"},
+        {"bin_type": "Food & Garden Waste", "date": "Friday 14 March 2025"},
+    ]
+
+
+def test_labelled_fields(checker, load_fixture):
+    """Date inputs are named by their label, wherever it appears, or by their id."""
+    schedule = checker.parse_results(load_fixture("labelled_fields.html"))
+    
+    assert schedule["collections"] == [
+        {"bin_type": "Mixed Recycling", "date": "03/03/2025"},
+        {"bin_type": "General Waste", "date": "10/03/2025"},
+        {"bin_type": "Gardendate1", "date": "14/03/2025"},
+    ]
+
+
+def test_fallback_reports_dates_found_on_page(checker, load_fixture):
+    """With nothing pairing a bin with a date, any dates in the page are reported."""
+    schedule = checker.parse_results(load_fixture("fallback.html"))
+    
+    assert schedule["collections"] == [
+        {"bin_type": "Date found on page", "date": "3 March 2025"},
+        {"bin_type": "Date found on page", "date": "10/03/2025"},
+    ]
+
+
+def test_empty_document(checker):
+    """An empty page parses to an empty schedule rather than raising."""
+    assert checker.parse_results("") == {"collections": [], "raw_text": []}
+
+
+def test_duplicates_are_dropped(checker, load_fixture):
+    """Repeats are dropped ignoring case, keeping the first in scan order."""
+    schedule = checker.parse_results(load_fixture("duplicates.html"))
+    
+    # Text elements are scanned before tables, so the text match for general
+    # waste comes first even though its table row is earlier in the page
+    assert schedule["collections"] == [
+        {"bin_type": "General waste 10/03/2025", "date": "10/03/2025"},
+        {"bin_type": "Mixed recycling", "date": "03/03/2025"},
+    ]
+
+
+def test_head_scripts_and_styles_are_ignored(checker, load_fixture):
+    """Dates in the head, scripts and stylesheets never reach the results."""
+    schedule = checker.parse_results(load_fixture("scripts_and_head.html"))
+    
+    assert schedule["collections"] == [
+        {"bin_type": "Date found on page", "date": "3 March 2025"},
+        {"bin_type": "Date found on page", "date": "10/03/2025"},
+    ]
+    assert schedule["raw_text"] == [
+        "Your next collections are on 3 March 2025 and 10/03/2025."
+    ]
@@ -0,0 +1,21 @@
+"""
+Tests for reading addresses piped in on stdin
+"""
+
+import io
+
+from bin_schedule_selenium import read_addresses
+
+
+def test_read_addresses_splits_number_and_postcode():
+    """The first token is the street number and the rest of the line the postcode."""
+    stream = io.StringIO("12 ab10 1ab\n3A AB11 5XY\n")
+    
+    assert read_addresses(stream) == [("AB10 1AB", "12"), ("AB11 5XY", "3A")]
+
+
+def test_read_addresses_skips_blank_and_single_token_lines():
+    """Lines without both a street number and a postcode are ignored."""
+    stream = io.StringIO("\n   \n12\nAB101AB\n7 AB10 1AB\n")
+    
+    assert read_addresses(stream) == [("AB10 1AB", "7")]